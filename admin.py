@@ -0,0 +1,143 @@
+from flask import Blueprint, current_app, flash, redirect, render_template, request, url_for
+from cleanup import delete_articles, remove_article_dirs
+from convert import convert_md_to_html
+from extensions import db
+from models import Article
+from utils import ALLOWED_TAGS, admin_required, save_article_to_file
+
+# Админ-панель
+admin_bp = Blueprint('admin', __name__)
+
+ADMIN_PAGE_SIZE = 50
+
+
+def _article_filters():
+    """Фильтры списка статей из query string (пустые значения игнорируются)."""
+    filters = {
+        'author': request.args.get('author', '').strip(),
+        'tag': request.args.get('tag', ''),
+        'registered': request.args.get('registered', '')
+    }
+    return {key: value for key, value in filters.items() if value}
+
+@admin_bp.route('/articles')
+@admin_required
+def articles():
+    """Админ-панель: управление статьями (постранично, по ключу id)."""
+    filters = _article_filters()
+    after = request.args.get('after', type=int)
+    before = request.args.get('before', type=int)
+
+    query = Article.query
+    if 'author' in filters:
+        query = query.filter(Article.author == filters['author'])
+    if 'tag' in filters:
+        query = query.filter(Article.tag == filters['tag'])
+    if 'registered' in filters:
+        query = query.filter(Article.registered == (filters['registered'] == '1'))
+
+    # Новые статьи сначала; берем на одну строку больше, чтобы понять, есть ли еще страница
+    if before:
+        articles = query.filter(Article.id > before) \
+                        .order_by(Article.id.asc()).limit(ADMIN_PAGE_SIZE + 1).all()
+        has_more = len(articles) > ADMIN_PAGE_SIZE
+        articles = articles[:ADMIN_PAGE_SIZE][::-1]
+        has_prev, has_next = has_more, True
+    else:
+        if after:
+            query = query.filter(Article.id < after)
+        articles = query.order_by(Article.id.desc()).limit(ADMIN_PAGE_SIZE + 1).all()
+        has_next = len(articles) > ADMIN_PAGE_SIZE
+        articles = articles[:ADMIN_PAGE_SIZE]
+        has_prev = after is not None
+
+    return render_template('admin/articles.html',
+                         articles=articles,
+                         filters=filters,
+                         allowed_tags=ALLOWED_TAGS,
+                         prev_cursor=articles[0].id if has_prev and articles else None,
+                         next_cursor=articles[-1].id if has_next and articles else None)
+
+@admin_bp.route('/articles/bulk', methods=['POST'])
+@admin_required
+def bulk_articles():
+    """Админ-панель: массовое удаление или смена тега выбранных статей."""
+    ids = request.form.getlist('ids', type=int)
+    action = request.form.get('action')
+    redirect_url = request.form.get('next') or url_for('admin.articles')
+    if not redirect_url.startswith('/') or redirect_url.startswith('//'):
+        redirect_url = url_for('admin.articles')
+
+    if not ids:
+        flash('Статьи не выбраны', 'error')
+        return redirect(redirect_url)
+
+    try:
+        if action == 'delete':
+            paths = delete_articles(ids)
+            db.session.commit()
+            remove_article_dirs(paths)
+            flash(f'Удалено статей: {len(paths)}', 'success')
+        elif action == 'retag':
+            tag = request.form.get('tag')
+            if tag not in ALLOWED_TAGS:
+                flash('Недопустимый тег. Выберите из списка.', 'error')
+                return redirect(redirect_url)
+            result = db.session.execute(
+                db.update(Article).where(Article.id.in_(ids)).values(tag=tag)
+            )
+            db.session.commit()
+            flash(f'Тег изменен у статей: {result.rowcount}', 'success')
+        else:
+            flash('Неизвестное действие', 'error')
+    except Exception as e:
+        db.session.rollback()
+        flash('Ошибка при обработке статей', 'error')
+        current_app.logger.error(f"Ошибка массовой операции со статьями: {str(e)}")
+
+    return redirect(redirect_url)
+
+@admin_bp.route('/delete_article/<int:id>', methods=['POST'])
+@admin_required
+def delete_article(id):
+    """Админ-панель: удаление статьи."""
+    article = Article.query.get_or_404(id)
+
+    try:
+        # Статья удаляется вместе с комментариями, лайками, просмотрами и рейтингом
+        paths = delete_articles([article.id])
+        db.session.commit()
+        remove_article_dirs(paths)
+        flash('Статья удалена', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash('Ошибка при удалении статьи', 'error')
+        current_app.logger.error(f"Ошибка удаления статьи: {str(e)}")
+
+    return redirect(url_for('admin.articles'))
+
+@admin_bp.route('/edit_article/<int:id>', methods=['GET', 'POST'])
+@admin_required
+def edit_article(id):
+    """Админ-панель: редактирование статьи."""
+    article = Article.query.get_or_404(id)
+
+    if request.method == 'POST':
+        article.name = request.form['name']
+        article.tag = request.form['tag']
+        article.registered = 'registered' in request.form
+
+        save_article_to_file(article.path, request.form['text'])
+        convert_md_to_html(article.path)
+        db.session.commit()
+
+        flash('Статья обновлена', 'success')
+        return redirect(url_for('admin.articles'))
+
+    with open(article.path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    return render_template('admin/edit_article.html',
+                         article=article,
+                         content=content,
+                         allowed_tags=ALLOWED_TAGS)
@@ -0,0 +1,111 @@
+from flask import Blueprint, jsonify, request
+from extensions import db
+from models import Article, User
+from trending import trending_articles
+from utils import ALLOWED_TAGS
+
+# API Blueprint
+api_bp = Blueprint('api', __name__)
+
+@api_bp.route('/articles', methods=['GET'])
+def get_all_articles():
+    """Получить список всех статей"""
+    sort_by = request.args.get('sort_by', 'date')
+
+    query = Article.query
+
+    if sort_by == 'views':
+        articles = query.order_by(Article.views.desc()).all()
+    elif sort_by == 'likes':
+        articles = query.order_by(Article.likes_count.desc()).all()
+    elif sort_by == 'trending':
+        articles = trending_articles(query)
+    elif sort_by == 'title':
+        articles = query.order_by(Article.name.asc()).all()
+    else:
+        articles = query.order_by(Article.created_at.desc()).all()
+
+    articles_data = [{
+        'id': article.id,
+        'title': article.name,
+        'author': article.author,
+        'tag': article.tag,
+        'views': article.views,
+        'likes': article.likes_count,
+        'created_at': article.created_at.isoformat(),
+        'registered_only': article.registered
+    } for article in articles]
+
+    return jsonify({
+        'articles': articles_data,
+        'sort_by': sort_by,
+        'total': len(articles)
+    })
+
+@api_bp.route('/articles/<int:article_id>', methods=['GET'])
+def get_article_details(article_id):
+    """Получить полную информацию о статье"""
+    article = Article.query.get_or_404(article_id)
+
+    return jsonify({
+        'id': article.id,
+        'title': article.name,
+        'author': article.author,
+        'tag': article.tag,
+        'views': article.views,
+        'likes': article.likes_count,
+        'created_at': article.created_at.isoformat(),
+        'registered_only': article.registered,
+        'comments_count': len(article.comments)}
+    )
+
+# Пользователи
+@api_bp.route('/users', methods=['GET'])
+def get_all_users():
+    """Получить список всех пользователей с сортировкой"""
+    sort_by = request.args.get('sort_by', 'username')
+
+    query = User.query
+
+    if sort_by == 'articles':
+        subquery = db.session.query(
+            Article.author,
+            db.func.count(Article.id).label('articles_count')
+        ).group_by(Article.author).subquery()
+
+        users = query.outerjoin(
+            subquery,
+            User.username == subquery.c.author
+        ).order_by(db.desc('articles_count')).all()
+    else:
+        users = query.order_by(User.username.asc()).all()
+
+    users_data = [{
+        'id': user.id,
+        'username': user.username,
+        'is_admin': user.is_admin,
+        'articles_count': Article.query.filter_by(author=user.username).count()
+    } for user in users]
+
+    return jsonify({
+        'users': users_data,
+        'sort_by': sort_by,
+        'total': len(users)
+    })
+
+# Теги
+@api_bp.route('/tags', methods=['GET'])
+def get_all_tags():
+    """Получить список тегов с сортировкой по популярности"""
+    tags_data = []
+
+    for tag in ALLOWED_TAGS:
+        count = Article.query.filter_by(tag=tag).count()
+        tags_data.append({
+            'name': tag,
+            'articles_count': count
+        })
+
+    tags_data.sort(key=lambda x: x['articles_count'], reverse=True)
+
+    return jsonify(tags_data)
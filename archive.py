@@ -0,0 +1,265 @@
+import io
+import json
+import os
+import tarfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from flask import current_app
+from convert import convert_md_to_html
+from extensions import db
+from models import Article, ArticleLike, Comment, User
+
+# Формат архива (tar, опционально gzip):
+#   users-00001.ndjson            — пользователи пачками
+#   articles-00001.ndjson         — статьи пачки с комментариями и лайками
+#   articles-00001/<id>.md        — тексты статей этой пачки
+# Каждая пачка статей идет сразу за своим ndjson, поэтому архив
+# пишется и читается потоково, без загрузки всего содержимого в память.
+ARCHIVE_BATCH_SIZE = 1000
+# Пароль импортированного без учетных данных пользователя: не является
+# хешем, поэтому check_password_hash всегда вернет False
+UNUSABLE_PASSWORD = '!'
+
+
+def _add_member(tar, name, data):
+    """Добавляет в потоковый tar-архив файл с содержимым data (bytes)."""
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(datetime.now().timestamp())
+    tar.addfile(info, io.BytesIO(data))
+
+def _ndjson(rows):
+    return ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows).encode('utf-8')
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+def _parse_datetime(value):
+    return datetime.fromisoformat(value) if value else None
+
+def _read_body(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except Exception as e:
+        current_app.logger.warning(f"Ошибка чтения файла статьи {path}: {str(e)}")
+        return ''
+
+def _safe_article_path(path):
+    """Проверяет, что путь из архива имеет вид articles/<директория>/<файл>.md.
+
+    Удаление статьи удаляет директорию ее файла целиком, поэтому путь вроде
+    articles/foo.md (или articles/a/../foo.md) привел бы к удалению всего
+    каталога articles/.
+    """
+    normalized = os.path.normpath(path).replace(os.sep, '/')
+    parts = normalized.split('/')
+    if (len(parts) != 3 or parts[0] != 'articles' or parts[1] in ('', '.', '..')
+            or not parts[2].endswith('.md') or parts[2] == '.md'):
+        raise ValueError(f"Недопустимый путь статьи в архиве: {path}")
+    return normalized
+
+
+def export_articles(archive_path, batch_size=ARCHIVE_BATCH_SIZE, include_credentials=False, progress=None):
+    """Потоково выгружает пользователей, статьи, комментарии и лайки в архив.
+
+    Пользователи выгружаются только по имени; хеши паролей и права
+    администратора попадают в архив лишь при include_credentials=True.
+    Возвращает количество выгруженных статей.
+    """
+    mode = 'w|gz' if archive_path.endswith(('.gz', '.tgz')) else 'w|'
+    exported = 0
+
+    with tarfile.open(archive_path, mode) as tar:
+        # Пользователи нужны, чтобы связать комментарии и лайки по имени
+        last_id, number = 0, 0
+        while True:
+            users = User.query.filter(User.id > last_id) \
+                              .order_by(User.id).limit(batch_size).all()
+            if not users:
+                break
+            number += 1
+            last_id = users[-1].id
+            _add_member(tar, f'users-{number:05d}.ndjson', _ndjson(
+                {'username': user.username, 'password': user.password, 'is_admin': user.is_admin}
+                if include_credentials else {'username': user.username}
+                for user in users
+            ))
+            db.session.expunge_all()
+
+        # Статьи пачками по ключу id
+        last_id, number = 0, 0
+        while True:
+            articles = Article.query.filter(Article.id > last_id) \
+                                    .order_by(Article.id).limit(batch_size).all()
+            if not articles:
+                break
+            number += 1
+            last_id = articles[-1].id
+            ids = [article.id for article in articles]
+
+            comments, likes = {}, {}
+            comment_rows = db.session.query(Comment.article_id, User.username, Comment.text, Comment.created_at) \
+                                     .join(User, User.id == Comment.user_id) \
+                                     .filter(Comment.article_id.in_(ids)) \
+                                     .order_by(Comment.id)
+            for article_id, username, text, created_at in comment_rows:
+                comments.setdefault(article_id, []).append({
+                    'author': username, 'text': text, 'created_at': _isoformat(created_at)
+                })
+            like_rows = db.session.query(ArticleLike.article_id, User.username, ArticleLike.created_at) \
+                                  .join(User, User.id == ArticleLike.user_id) \
+                                  .filter(ArticleLike.article_id.in_(ids))
+            for article_id, username, created_at in like_rows:
+                likes.setdefault(article_id, []).append({
+                    'user': username, 'created_at': _isoformat(created_at)
+                })
+
+            batch_name = f'articles-{number:05d}'
+            _add_member(tar, f'{batch_name}.ndjson', _ndjson({
+                'id': article.id,
+                'author': article.author,
+                'name': article.name,
+                'tag': article.tag,
+                'registered': article.registered,
+                'path': article.path,
+                'created_at': _isoformat(article.created_at),
+                'views': article.views,
+                'likes_count': article.likes_count,
+                'comments': comments.get(article.id, []),
+                'likes': likes.get(article.id, [])
+            } for article in articles))
+            for article in articles:
+                _add_member(tar, f'{batch_name}/{article.id}.md',
+                            _read_body(article.path).encode('utf-8'))
+
+            exported += len(articles)
+            db.session.expunge_all()
+            if progress:
+                progress(exported)
+
+    return exported
+
+
+def _import_users(rows):
+    """Добавляет отсутствующих пользователей одним пакетным INSERT."""
+    usernames = [row['username'] for row in rows]
+    existing = {name for (name,) in db.session.query(User.username)
+                                              .filter(User.username.in_(usernames))}
+    new_rows = [row for row in rows if row['username'] not in existing]
+    if new_rows:
+        db.session.execute(db.insert(User), new_rows)
+    db.session.commit()
+
+def _user_ids(usernames):
+    if not usernames:
+        return {}
+    return dict(db.session.query(User.username, User.id).filter(User.username.in_(usernames)))
+
+def _import_article_batch(rows, bodies, executor):
+    """Импортирует одну пачку статей в одной транзакции.
+
+    Статьи, путь которых уже есть в базе, пропускаются — это делает импорт
+    идемпотентным и позволяет продолжить его после прерывания.
+    """
+    for row in rows:
+        row['path'] = _safe_article_path(row['path'])
+
+    paths = [row['path'] for row in rows]
+    existing = {path for (path,) in db.session.query(Article.path).filter(Article.path.in_(paths))}
+    rows = [row for row in rows if row['path'] not in existing]
+    if not rows:
+        return 0
+
+    # Тексты пишутся на диск, HTML рендерится параллельно в процессах
+    paths = [row['path'] for row in rows]
+    for row in rows:
+        os.makedirs(os.path.dirname(row['path']), exist_ok=True)
+        with open(row['path'], 'w', encoding='utf-8') as f:
+            f.write(bodies.get(row['id'], ''))
+    for path, converted in zip(paths, executor.map(convert_md_to_html, paths, chunksize=32)):
+        if not converted:
+            current_app.logger.warning(f"Не удалось сконвертировать {path}")
+
+    db.session.execute(db.insert(Article), [{
+        'author': row['author'],
+        'name': row['name'],
+        'tag': row['tag'],
+        'registered': row['registered'],
+        'path': row['path'],
+        'created_at': _parse_datetime(row['created_at']),
+        'views': row['views'] or 0,
+        'likes_count': row['likes_count'] or 0
+    } for row in rows])
+
+    article_ids = dict(db.session.query(Article.path, Article.id).filter(Article.path.in_(paths)))
+    user_ids = _user_ids({comment['author'] for row in rows for comment in row['comments']} |
+                         {like['user'] for row in rows for like in row['likes']})
+
+    comments = [{
+        'text': comment['text'],
+        'created_at': _parse_datetime(comment['created_at']),
+        'user_id': user_ids[comment['author']],
+        'article_id': article_ids[row['path']]
+    } for row in rows for comment in row['comments'] if comment['author'] in user_ids]
+    likes = [{
+        'user_id': user_ids[like['user']],
+        'article_id': article_ids[row['path']],
+        'created_at': _parse_datetime(like['created_at'])
+    } for row in rows for like in row['likes'] if like['user'] in user_ids]
+
+    if comments:
+        db.session.execute(db.insert(Comment), comments)
+    if likes:
+        db.session.execute(db.insert(ArticleLike), likes)
+    db.session.commit()
+    return len(rows)
+
+def import_articles(archive_path, workers=None, include_credentials=False, progress=None):
+    """Потоково загружает архив, созданный export_articles.
+
+    Новые пользователи создаются без прав администратора и с непригодным
+    для входа паролем; пароли и права из архива переносятся только при
+    include_credentials=True. Возвращает количество импортированных (новых) статей.
+    """
+    imported = 0
+    rows, bodies = None, {}
+
+    with tarfile.open(archive_path, 'r|*') as tar, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        for member in tar:
+            if not member.isfile():
+                continue
+            data = tar.extractfile(member).read().decode('utf-8')
+            name = member.name
+
+            if name.endswith('.ndjson'):
+                # Начало новой пачки — сохраняем предыдущую
+                if rows is not None:
+                    imported += _import_article_batch(rows, bodies, executor)
+                    if progress:
+                        progress(imported)
+                    rows, bodies = None, {}
+
+                records = [json.loads(line) for line in data.splitlines() if line.strip()]
+                if name.startswith('users-'):
+                    _import_users([{
+                        'username': record['username'],
+                        'password': record.get('password') or UNUSABLE_PASSWORD,
+                        'is_admin': bool(record.get('is_admin'))
+                    } if include_credentials else {
+                        'username': record['username'],
+                        'password': UNUSABLE_PASSWORD,
+                        'is_admin': False
+                    } for record in records])
+                else:
+                    rows = records
+            elif name.endswith('.md') and rows is not None:
+                bodies[int(os.path.basename(name)[:-3])] = data
+
+        if rows is not None:
+            imported += _import_article_batch(rows, bodies, executor)
+            if progress:
+                progress(imported)
+
+    return imported
@@ -0,0 +1,160 @@
+import os
+import shutil
+import threading
+import time
+from flask import current_app
+from extensions import db
+from models import DEFAULT_AVATAR, Article, ArticleLike, ArticleScore, ArticleView, Comment, User
+
+CLEANUP_BATCH_SIZE = 500
+# Файлы моложе этого возраста не считаются "сиротами": статья или аватар
+# могли быть только что записаны на диск, а строка в БД — еще нет
+ORPHAN_GRACE_SECONDS = 3600
+
+
+def delete_articles(ids):
+    """Удаляет статьи и связанные с ними строки пакетными DELETE.
+
+    Коммит остается за вызывающим кодом. Возвращает пути к файлам удаленных статей.
+    """
+    paths = [path for (path,) in db.session.query(Article.path).filter(Article.id.in_(ids))]
+    for model in (Comment, ArticleLike, ArticleView):
+        db.session.execute(db.delete(model).where(model.article_id.in_(ids)))
+    db.session.execute(db.delete(ArticleScore).where(ArticleScore.article_id.in_(ids)))
+    db.session.execute(db.delete(Article).where(Article.id.in_(ids)))
+    return paths
+
+def remove_article_dirs(paths):
+    """Удаляет с диска директории статей (после коммита транзакции)."""
+    for path in paths:
+        article_dir = os.path.dirname(path)
+        if os.path.exists(article_dir):
+            shutil.rmtree(article_dir, ignore_errors=True)
+
+def remove_files_async(article_paths, avatar_path=None):
+    """Удаляет файлы статей и аватар в фоновом потоке, возвращает поток."""
+    def run():
+        remove_article_dirs(article_paths)
+        if avatar_path and os.path.exists(avatar_path):
+            os.remove(avatar_path)
+
+    thread = threading.Thread(target=run, name='cleanup-files')
+    thread.start()
+    return thread
+
+def _delete_articles_where(condition, batch_size, progress=None):
+    """Удаляет статьи по условию пачками по id; возвращает пути их файлов."""
+    paths = []
+    while True:
+        ids = [article_id for (article_id,) in db.session.query(Article.id)
+                                                         .filter(condition)
+                                                         .limit(batch_size)]
+        if not ids:
+            return paths
+        paths.extend(delete_articles(ids))
+        if progress:
+            progress(len(paths))
+
+def delete_user(user, batch_size=CLEANUP_BATCH_SIZE, progress=None):
+    """Удаляет пользователя со всеми его данными в одной транзакции.
+
+    Статьи удаляются пачками, остальные данные — одним DELETE на таблицу.
+    Файлы статей и аватар удаляются в фоне после коммита; возвращает
+    количество удаленных статей и поток удаления файлов.
+    """
+    user_id, username = user.id, user.username
+    avatar_path = None
+    if user.avatar and user.avatar != DEFAULT_AVATAR:
+        avatar_path = os.path.join(current_app.config['UPLOAD_FOLDER'], user.avatar)
+
+    try:
+        paths = _delete_articles_where(Article.author == username, batch_size, progress)
+
+        # Лайки пользователя на чужих статьях уменьшают их счетчики
+        liked = db.session.query(ArticleLike.article_id).filter(ArticleLike.user_id == user_id)
+        user_likes = db.session.query(db.func.count(ArticleLike.id)).filter(
+            ArticleLike.article_id == Article.id,
+            ArticleLike.user_id == user_id
+        ).scalar_subquery()
+        db.session.execute(
+            db.update(Article).where(Article.id.in_(liked))
+                              .values(likes_count=Article.likes_count - user_likes)
+        )
+
+        for model in (Comment, ArticleLike, ArticleView):
+            db.session.execute(db.delete(model).where(model.user_id == user_id))
+        db.session.execute(db.delete(User).where(User.id == user_id))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return len(paths), remove_files_async(paths, avatar_path)
+
+def _is_stale(path, now):
+    return now - os.path.getmtime(path) > ORPHAN_GRACE_SECONDS
+
+def sweep_orphans(batch_size=CLEANUP_BATCH_SIZE, progress=None):
+    """Удаляет записи и файлы, оставшиеся без владельца.
+
+    Возвращает словарь с количеством удаленных объектов по видам.
+    """
+    stats = {}
+    user_ids = db.select(User.id)
+    article_ids = db.select(Article.id)
+
+    try:
+        # Статьи удаленных пользователей (связаны только по имени автора)
+        paths = _delete_articles_where(~Article.author.in_(db.select(User.username)), batch_size, progress)
+        stats['articles'] = len(paths)
+
+        for name, model in (('comments', Comment), ('likes', ArticleLike), ('views', ArticleView)):
+            result = db.session.execute(db.delete(model).where(db.or_(
+                model.user_id.is_(None),
+                model.article_id.is_(None),
+                ~model.user_id.in_(user_ids),
+                ~model.article_id.in_(article_ids)
+            )))
+            stats[name] = result.rowcount
+        result = db.session.execute(db.delete(ArticleScore).where(~ArticleScore.article_id.in_(article_ids)))
+        stats['scores'] = result.rowcount
+
+        # Счетчики лайков, разошедшиеся с реальным числом строк ArticleLike
+        likes = db.session.query(db.func.count(ArticleLike.id)) \
+                          .filter(ArticleLike.article_id == Article.id) \
+                          .scalar_subquery()
+        result = db.session.execute(
+            db.update(Article).where(Article.likes_count != likes).values(likes_count=likes)
+        )
+        stats['likes_count'] = result.rowcount
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    remove_article_dirs(paths)
+
+    now = time.time()
+
+    # Директории статей, на которые не ссылается ни одна запись
+    known_dirs = {os.path.normpath(os.path.dirname(path))
+                  for (path,) in db.session.query(Article.path).yield_per(batch_size)}
+    stats['article_dirs'] = 0
+    if os.path.isdir('articles'):
+        for entry in os.scandir('articles'):
+            path = os.path.normpath(entry.path)
+            if entry.is_dir() and path not in known_dirs and _is_stale(path, now):
+                shutil.rmtree(path, ignore_errors=True)
+                stats['article_dirs'] += 1
+
+    # Аватары удаленных пользователей
+    upload_folder = current_app.config['UPLOAD_FOLDER']
+    known_avatars = {avatar for (avatar,) in db.session.query(User.avatar).distinct()}
+    known_avatars.add(DEFAULT_AVATAR)
+    stats['avatars'] = 0
+    if os.path.isdir(upload_folder):
+        for entry in os.scandir(upload_folder):
+            if entry.is_file() and entry.name not in known_avatars and _is_stale(entry.path, now):
+                os.remove(entry.path)
+                stats['avatars'] += 1
+
+    return stats
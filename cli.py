@@ -0,0 +1,88 @@
+import click
+from flask import Blueprint
+from extensions import db
+from models import User
+
+# CLI команды (cli_group=None — команды доступны как `flask create-admin`).
+# Модули archive, cleanup и trending импортируются внутри команд: Flask
+# загружает приложение при каждом вызове CLI, и остальным командам они не нужны.
+cli_bp = Blueprint('cli', __name__, cli_group=None)
+
+@cli_bp.cli.command("create-admin")
+@click.argument("username")
+def create_admin(username):
+    """Назначение прав администратора."""
+    user = User.query.filter_by(username=username).first()
+
+    if not user:
+        click.echo(f"Пользователь {username} не найден")
+        return
+
+    user.is_admin = True
+    db.session.commit()
+    click.echo(f"Пользователь {username} теперь администратор")
+
+@cli_bp.cli.command("list-users")
+def list_users():
+    """Список всех пользователей."""
+    users = User.query.all()
+    for user in users:
+        status = "Админ" if user.is_admin else "Обычный"
+        click.echo(f"{user.id}: {user.username} ({status})")
+
+@cli_bp.cli.command("delete-user")
+@click.argument("username")
+def delete_user_command(username):
+    """Удаление пользователя вместе с его статьями, комментариями и лайками."""
+    from cleanup import delete_user
+
+    user = User.query.filter_by(username=username).first()
+    if not user:
+        click.echo(f"Пользователь {username} не найден")
+        return
+
+    deleted, files_thread = delete_user(user, progress=lambda count: click.echo(f"Удалено статей: {count}"))
+    click.echo(f"Пользователь {username} удален (статей: {deleted}), удаляются файлы...")
+    files_thread.join()
+    click.echo("Файлы удалены")
+
+@cli_bp.cli.command("sweep-orphans")
+def sweep_orphans_command():
+    """Очистка записей и файлов, оставшихся без владельца."""
+    from cleanup import sweep_orphans
+
+    stats = sweep_orphans(progress=lambda count: click.echo(f"Удалено статей без автора: {count}"))
+    for name, count in stats.items():
+        click.echo(f"{name}: {count}")
+
+@cli_bp.cli.command("update-trending")
+def update_trending():
+    """Пересчет рейтинга популярных статей."""
+    from trending import update_trending_scores
+
+    updated = update_trending_scores()
+    click.echo(f"Рейтинг обновлен для статей: {updated}")
+
+@cli_bp.cli.command("export-articles")
+@click.argument("archive_path", type=click.Path(dir_okay=False))
+@click.option("--batch-size", type=int, default=None, help="Статей в одной пачке (по умолчанию ARCHIVE_BATCH_SIZE).")
+@click.option("--include-credentials", is_flag=True, help="Выгрузить хеши паролей и права администратора (полный бэкап).")
+def export_articles_command(archive_path, batch_size, include_credentials):
+    """Выгрузка статей, комментариев и лайков в архив (tar/tar.gz)."""
+    from archive import ARCHIVE_BATCH_SIZE, export_articles
+
+    exported = export_articles(archive_path, batch_size or ARCHIVE_BATCH_SIZE, include_credentials,
+                               progress=lambda count: click.echo(f"Выгружено статей: {count}"))
+    click.echo(f"Готово, выгружено статей: {exported}")
+
+@cli_bp.cli.command("import-articles")
+@click.argument("archive_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--workers", type=int, default=None, help="Процессов для рендеринга HTML (по умолчанию — число CPU).")
+@click.option("--include-credentials", is_flag=True, help="Перенести пароли и права администратора из архива.")
+def import_articles_command(archive_path, workers, include_credentials):
+    """Загрузка статей из архива. Повторный запуск продолжает прерванный импорт."""
+    from archive import import_articles
+
+    imported = import_articles(archive_path, workers, include_credentials,
+                               progress=lambda count: click.echo(f"Импортировано статей: {count}"))
+    click.echo(f"Готово, импортировано новых статей: {imported}")
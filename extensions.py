@@ -0,0 +1,9 @@
+from flask_login import LoginManager
+from flask_sqlalchemy import SQLAlchemy
+from ratelimit import RateLimiter
+
+# Расширения создаются без приложения и подключаются в create_app()
+db = SQLAlchemy()
+login_manager = LoginManager()
+login_manager.login_view = 'web.login'
+limiter = RateLimiter()
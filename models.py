@@ -0,0 +1,155 @@
+from datetime import datetime, timezone
+from flask_login import UserMixin
+from sqlalchemy.schema import CreateTable
+from extensions import db, login_manager
+
+DEFAULT_AVATAR = 'default_avatar.jpg'
+
+
+# Модели базы данных
+class User(UserMixin, db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    password = db.Column(db.String(120), nullable=False)
+    avatar = db.Column(db.String(200), default=DEFAULT_AVATAR)
+    is_admin = db.Column(db.Boolean, default=False)
+    comments = db.relationship('Comment', backref='author', lazy=True)
+
+class Article(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    author = db.Column(db.String(80), nullable=False, index=True)
+    name = db.Column(db.String(120), nullable=False)
+    tag = db.Column(db.String(50), nullable=False, index=True)
+    registered = db.Column(db.Boolean, nullable=False)
+    path = db.Column(db.String(200), nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    comments = db.relationship('Comment', backref='article', lazy=True,
+                             order_by="Comment.created_at.desc()")
+    views = db.Column(db.Integer, default=0)
+    likes_count = db.Column(db.Integer, default=0)
+
+    # AUTOINCREMENT: id удаленных строк не выдаются повторно, на этом
+    # основаны отметки TrendingWatermark (то же у ArticleView и ArticleLike)
+    __table_args__ = {'sqlite_autoincrement': True}
+
+class Comment(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    text = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'))
+
+class ArticleView(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'))
+    viewed_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'article_id', name='uix_user_article'),
+        {'sqlite_autoincrement': True},
+    )
+
+class ArticleLike(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'))
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'))
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = {'sqlite_autoincrement': True}
+
+class ArticleScore(db.Model):
+    """Предрассчитанный рейтинг статьи для сортировки "в тренде"."""
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'), primary_key=True)
+    score = db.Column(db.Float, nullable=False, index=True)
+    # Слагаемые рейтинга: публикация и просмотры (только растут) и лайки
+    # (пересчитываются целиком, т.к. лайк можно снять)
+    base_score = db.Column(db.Float)
+    like_score = db.Column(db.Float)
+    likes_seen = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False)
+    # Копия Article.registered: лента для анонимов фильтруется и сортируется
+    # по одному индексу (registered, score), без сортировки во время запроса
+    registered = db.Column(db.Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        db.Index('ix_article_score_registered_score', 'registered', 'score'),
+    )
+
+class TrendingWatermark(db.Model):
+    """Последний учтенный в рейтинге id строки для каждого источника событий."""
+    source = db.Column(db.String(20), primary_key=True)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+
+class RateLimitBucket(db.Model):
+    """Корзина токенов для ограничения частоты запросов (бэкенд 'sqlite')."""
+    key = db.Column(db.String(200), primary_key=True)
+    tokens = db.Column(db.Float, nullable=False)
+    updated = db.Column(db.Float, nullable=False)
+    full_at = db.Column(db.Float, nullable=False, index=True)
+
+
+# Источник событий TrendingWatermark для каждой таблицы
+_WATERMARK_SOURCES = {'article': 'article', 'article_view': 'view', 'article_like': 'like'}
+
+def enable_autoincrement():
+    """Пересоздает с AUTOINCREMENT таблицы, созданные без него.
+
+    Без AUTOINCREMENT SQLite после удаления последней строки снова выдает
+    ее id, и отметки TrendingWatermark пропускают новые строки. Таблица
+    копируется в новую, созданную по модели, и заменяет старую; индексы
+    затем восстанавливает create_missing_indexes(). Счетчик id начинается
+    не ниже отметки рейтинга, чтобы уже освободившиеся id тоже не вернулись.
+    """
+    with db.engine.begin() as connection:
+        existing = dict(connection.exec_driver_sql(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'table'"
+        ).all())
+        for table in db.metadata.sorted_tables:
+            if (not table.dialect_options['sqlite']['autoincrement']
+                    or table.name not in existing
+                    or 'AUTOINCREMENT' in existing[table.name].upper()):
+                continue
+
+            new_name = f'{table.name}_autoincrement'
+            old_columns = {column['name'] for column in db.inspect(connection).get_columns(table.name)}
+            columns = ', '.join(column.name for column in table.columns if column.name in old_columns)
+            ddl = str(CreateTable(table).compile(connection)).replace(
+                f'CREATE TABLE {table.name} ', f'CREATE TABLE {new_name} ', 1
+            )
+            connection.exec_driver_sql(f'DROP TABLE IF EXISTS {new_name}')
+            connection.exec_driver_sql(ddl)
+            connection.exec_driver_sql(
+                f'INSERT INTO {new_name} ({columns}) SELECT {columns} FROM {table.name}'
+            )
+            connection.exec_driver_sql(f'DROP TABLE {table.name}')
+            connection.exec_driver_sql(f'ALTER TABLE {new_name} RENAME TO {table.name}')
+
+            last_id = max(
+                connection.execute(db.select(db.func.max(table.c.id))).scalar() or 0,
+                connection.execute(db.select(TrendingWatermark.last_id).where(
+                    TrendingWatermark.source == _WATERMARK_SOURCES.get(table.name)
+                )).scalar() or 0
+            )
+            connection.exec_driver_sql('DELETE FROM sqlite_sequence WHERE name = ?', (table.name,))
+            connection.exec_driver_sql('INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)',
+                                       (table.name, last_id))
+
+def create_missing_indexes():
+    """Создает индексы моделей, которых нет в уже существующих таблицах.
+
+    db.create_all() не трогает существующие таблицы, поэтому индексы,
+    добавленные в модели позже (например, Article.author и Article.tag),
+    без этого шага не появятся в рабочей базе.
+    """
+    existing_tables = set(db.inspect(db.engine).get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name in existing_tables:
+            for index in table.indexes:
+                index.create(db.engine, checkfirst=True)
+
+
+# Загрузчик пользователя для Flask-Login
+@login_manager.user_loader
+def load_user(user_id):
+    return User.query.get(int(user_id))
@@ -0,0 +1,48 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Хеширование паролей (scrypt) нагружает CPU; hashlib отпускает GIL,
+# поэтому пул потоков ограничивает число одновременных вычислений.
+# Приложение синхронное: поток запроса все равно ждет результат (и до
+# HASH_QUEUE_TIMEOUT — место в очереди). Пул не освобождает потоки
+# запросов, а лишь не дает всплеску входов загрузить все ядра и быстро
+# отказывает (503), когда очередь переполнена.
+HASH_WORKERS = min(4, os.cpu_count() or 1)
+HASH_QUEUE_SIZE = HASH_WORKERS * 8  # сколько задач может ждать в очереди
+HASH_QUEUE_TIMEOUT = 5  # секунды ожидания места в очереди
+
+
+class PasswordHasherBusy(Exception):
+    """Очередь хеширования паролей переполнена."""
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(HASH_WORKERS + HASH_QUEUE_SIZE)
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix='password-hash')
+        return _executor
+
+def _run(func, *args):
+    """Выполняет func в пуле; при переполненной очереди бросает PasswordHasherBusy."""
+    if not _slots.acquire(timeout=HASH_QUEUE_TIMEOUT):
+        raise PasswordHasherBusy()
+    try:
+        return _get_executor().submit(func, *args).result()
+    finally:
+        _slots.release()
+
+def hash_password(password):
+    """Хеш пароля, вычисленный в пуле."""
+    return _run(generate_password_hash, password)
+
+def verify_password(password_hash, password):
+    """Проверка пароля по хешу, выполненная в пуле."""
+    return _run(check_password_hash, password_hash, password)
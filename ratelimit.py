@@ -0,0 +1,131 @@
+import threading
+import time
+from functools import wraps
+from flask import current_app, flash, jsonify, make_response, redirect, request, url_for
+from flask_login import current_user
+from sqlalchemy import text
+
+# Как часто удалять из памяти/БД заполнившиеся (неактивные) корзины, секунды
+RATELIMIT_EVICT_INTERVAL = 60
+
+
+class MemoryBackend:
+    """Корзины токенов в памяти процесса.
+
+    Для каждого ключа хранится кортеж (токены, время обновления, момент
+    полного наполнения). Полная корзина неотличима от новой, поэтому
+    периодически такие корзины просто удаляются.
+    """
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._next_eviction = time.monotonic() + RATELIMIT_EVICT_INTERVAL
+
+    def consume(self, key, capacity, rate):
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_eviction:
+                self._evict(now)
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+            return allowed
+
+    def _evict(self, now):
+        self._buckets = {
+            key: bucket for key, bucket in self._buckets.items() if bucket[2] > now
+        }
+        self._next_eviction = now + RATELIMIT_EVICT_INTERVAL
+
+
+class SQLiteBackend:
+    """Общие для нескольких процессов корзины в таблице rate_limit_bucket.
+
+    Пополнение и списание токена выполняются одним UPSERT, поэтому
+    проверка атомарна без явных блокировок.
+    """
+
+    _consume_sql = text(
+        "INSERT INTO rate_limit_bucket (key, tokens, updated, full_at) "
+        "VALUES (:key, :capacity - 1, :now, :now + 1 / :rate) "
+        "ON CONFLICT (key) DO UPDATE SET "
+        "tokens = min(:capacity, tokens + (:now - updated) * :rate) - 1, "
+        "full_at = :now + (:capacity - min(:capacity, tokens + (:now - updated) * :rate) + 1) / :rate, "
+        "updated = :now "
+        "WHERE min(:capacity, tokens + (:now - updated) * :rate) >= 1"
+    )
+    _evict_sql = text("DELETE FROM rate_limit_bucket WHERE full_at < :now")
+
+    def __init__(self):
+        self._next_eviction = time.time() + RATELIMIT_EVICT_INTERVAL
+
+    def consume(self, key, capacity, rate):
+        # Импорт здесь: extensions создает экземпляр RateLimiter из этого модуля
+        from extensions import db
+
+        now = time.time()
+        with db.engine.begin() as connection:
+            if now >= self._next_eviction:
+                self._next_eviction = now + RATELIMIT_EVICT_INTERVAL
+                connection.execute(self._evict_sql, {'now': now})
+            result = connection.execute(self._consume_sql, {
+                'key': key, 'capacity': capacity, 'rate': rate, 'now': now
+            })
+        return result.rowcount > 0
+
+
+class RateLimiter:
+    """Ограничение частоты запросов по алгоритму token bucket.
+
+    Бэкенд выбирается настройкой RATELIMIT_BACKEND: 'memory' (по умолчанию)
+    или 'sqlite' для нескольких процессов с общей базой.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RATELIMIT_ENABLED', True)
+        app.config.setdefault('RATELIMIT_BACKEND', 'memory')
+        if app.config['RATELIMIT_BACKEND'] == 'sqlite':
+            app.extensions['ratelimit'] = SQLiteBackend()
+        else:
+            app.extensions['ratelimit'] = MemoryBackend()
+
+    def limit(self, name, capacity, per_seconds):
+        """Декоратор: не больше capacity POST-запросов за per_seconds на пользователя/IP."""
+        rate = capacity / per_seconds
+
+        def decorator(f):
+            @wraps(f)
+            def decorated_function(*args, **kwargs):
+                # GET-запросы (показ форм) не ограничиваются
+                if request.method != 'POST' or not current_app.config['RATELIMIT_ENABLED']:
+                    return f(*args, **kwargs)
+
+                if current_user.is_authenticated:
+                    key = f"{name}:user:{current_user.id}"
+                else:
+                    key = f"{name}:ip:{request.remote_addr}"
+
+                if current_app.extensions['ratelimit'].consume(key, capacity, rate):
+                    return f(*args, **kwargs)
+                return self._limited_response(per_seconds / capacity)
+            return decorated_function
+        return decorator
+
+    @staticmethod
+    def _limited_response(retry_after):
+        message = 'Слишком много запросов, попробуйте позже'
+        if request.is_json:
+            response = make_response(jsonify({'error': message}), 429)
+        else:
+            flash(message, 'error')
+            response = redirect(request.referrer or url_for('web.index'))
+        response.headers['Retry-After'] = str(max(1, round(retry_after)))
+        return response
@@ -0,0 +1,179 @@
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from extensions import db
+from models import Article, ArticleLike, ArticleScore, ArticleView, TrendingWatermark
+
+# Параметры рейтинга "в тренде"
+TRENDING_HALF_LIFE = timedelta(hours=24)  # за это время вес события падает вдвое
+TRENDING_LIMIT = 50  # сколько статей показывать в ленте
+TRENDING_WEIGHTS = {'article': 5.0, 'like': 3.0, 'view': 1.0}
+
+# Точка отсчета для логарифмической шкалы рейтинга
+_EPOCH = datetime(2025, 1, 1)
+_DECAY_RATE = math.log(2) / TRENDING_HALF_LIFE.total_seconds()
+
+
+def _utcnow():
+    """Текущее время UTC без tzinfo — в таком виде даты хранятся в SQLite."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def _log_weight(weight, moment):
+    """Логарифм веса события, приведенного к моменту _EPOCH.
+
+    Рейтинг хранится как log(sum(w * exp(rate * (t - epoch)))). Сравнение
+    таких значений эквивалентно сравнению рейтингов с экспоненциальным
+    затуханием на любой момент времени, поэтому старые строки не нужно
+    пересчитывать — достаточно добавить вклад новых событий.
+    """
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return math.log(weight) + _DECAY_RATE * (moment - _EPOCH).total_seconds()
+
+def _log_add(a, b):
+    """Устойчивое вычисление log(exp(a) + exp(b)); None — пустая сумма."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+def _chunks(values, size=500):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+def _watermark(source):
+    watermark = db.session.get(TrendingWatermark, source)
+    if watermark is None:
+        watermark = TrendingWatermark(source=source, last_id=0)
+        db.session.add(watermark)
+    return watermark
+
+def update_trending_scores(now=None):
+    """Инкрементально обновляет таблицу рейтингов.
+
+    Новые события отбираются по id строк, а не по времени: строки,
+    закоммиченные позже запуска, и импортированные данные со старыми датами
+    не теряются. Публикации и просмотры только добавляют вклад. Вклад лайков
+    пересчитывается для статей с новыми или снятыми лайками по текущим
+    строкам ArticleLike, не больше одного лайка на пользователя, поэтому
+    снятие лайка уменьшает рейтинг, а повторные лайки его не накручивают.
+
+    Возвращает количество обновленных статей.
+    """
+    now = now or _utcnow()
+
+    # Публикации и просмотры: добавляем вклад новых строк
+    base_increments = {}
+    sources = [
+        ('article', Article.id, Article.id, Article.created_at, TRENDING_WEIGHTS['article']),
+        ('view', ArticleView.id, ArticleView.article_id, ArticleView.viewed_at, TRENDING_WEIGHTS['view']),
+    ]
+    for source, id_col, article_col, time_col, weight in sources:
+        watermark = _watermark(source)
+        rows = db.session.query(id_col, article_col, time_col) \
+                         .filter(id_col > watermark.last_id) \
+                         .order_by(id_col)
+        for row_id, article_id, moment in rows:
+            watermark.last_id = row_id
+            if article_id is None or moment is None:
+                continue
+            value = _log_weight(weight, moment)
+            base_increments[article_id] = _log_add(base_increments.get(article_id), value)
+
+    # Лайки: статьи с новыми строками или изменившимся счетчиком
+    watermark = _watermark('like')
+    liked = set()
+    for row_id, article_id in db.session.query(ArticleLike.id, ArticleLike.article_id) \
+                                        .filter(ArticleLike.id > watermark.last_id) \
+                                        .order_by(ArticleLike.id):
+        watermark.last_id = row_id
+        if article_id is not None:
+            liked.add(article_id)
+    liked.update(article_id for (article_id,) in
+                 db.session.query(ArticleScore.article_id)
+                           .join(Article, Article.id == ArticleScore.article_id)
+                           .filter(Article.likes_count != ArticleScore.likes_seen))
+
+    like_scores = dict.fromkeys(liked)
+    likes_count = {}
+    for chunk in _chunks(liked):
+        rows = db.session.query(ArticleLike.article_id, db.func.max(ArticleLike.created_at)) \
+                         .filter(ArticleLike.article_id.in_(chunk),
+                                 ArticleLike.user_id.isnot(None)) \
+                         .group_by(ArticleLike.article_id, ArticleLike.user_id)
+        for article_id, moment in rows:
+            if moment is not None:
+                value = _log_weight(TRENDING_WEIGHTS['like'], moment)
+                like_scores[article_id] = _log_add(like_scores[article_id], value)
+        likes_count.update(db.session.query(Article.id, Article.likes_count).filter(Article.id.in_(chunk)))
+
+    affected = set(base_increments) | liked
+    scores = {}
+    for chunk in _chunks(affected):
+        scores.update((score.article_id, score) for score in
+                      ArticleScore.query.filter(ArticleScore.article_id.in_(chunk)))
+
+    for article_id in affected:
+        score = scores.get(article_id)
+        if score is None:
+            score = ArticleScore(article_id=article_id, likes_seen=0)
+        if article_id in base_increments:
+            score.base_score = _log_add(score.base_score, base_increments[article_id])
+        if article_id in liked:
+            score.like_score = like_scores[article_id]
+            score.likes_seen = likes_count.get(article_id) or 0
+        score.score = _log_add(score.base_score, score.like_score)
+        score.updated_at = now
+
+        if score.score is None:
+            # Событий не осталось (например, статья удалена) — строка не нужна
+            if article_id in scores:
+                db.session.delete(score)
+        elif article_id not in scores:
+            db.session.add(score)
+
+    _sync_registered()
+    db.session.commit()
+    return len(affected)
+
+def _sync_registered():
+    """Переносит в таблицу рейтингов изменившийся флаг registered статей."""
+    db.session.execute(
+        db.update(ArticleScore)
+          .where(ArticleScore.article_id == Article.id,
+                 ArticleScore.registered != Article.registered)
+          .values(registered=Article.registered)
+    )
+
+def trending_articles(query, include_registered=True, limit=TRENDING_LIMIT):
+    """Топ статей по предрассчитанному рейтингу.
+
+    Для анонимов (include_registered=False) фильтр по registered выполняется
+    по индексу (registered, score) таблицы рейтингов. Фильтр запроса по самой
+    статье при этом сохраняется, поэтому отставание копии флага до следующего
+    пересчета не открывает закрытые статьи.
+    """
+    query = query.join(ArticleScore, ArticleScore.article_id == Article.id)
+    if not include_registered:
+        query = query.filter(ArticleScore.registered.is_(False))
+    return query.order_by(ArticleScore.score.desc()).limit(limit).all()
+
+def start_trending_job(app, interval=300):
+    """Запускает фоновый поток, периодически обновляющий рейтинг."""
+    def run():
+        while True:
+            with app.app_context():
+                try:
+                    update_trending_scores()
+                except Exception as e:
+                    db.session.rollback()
+                    app.logger.error(f"Ошибка обновления рейтинга: {str(e)}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name='trending-job', daemon=True)
+    thread.start()
+    return thread
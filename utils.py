@@ -0,0 +1,41 @@
+import re
+from functools import wraps
+from flask import current_app, flash, redirect, url_for
+from flask_login import current_user
+
+# Константы
+ALLOWED_TAGS = ['Python', 'Flask', 'SQLite', 'Web Development', 'Tutorial']
+
+
+# Вспомогательные функции
+def sanitize_filename(filename):
+    """Очищает имя файла, преобразует кириллицу и удаляет недопустимые символы."""
+    # transliterate загружает языковые пакеты, поэтому импортируется при первом вызове
+    from transliterate import translit
+
+    filename = translit(filename, 'ru', reversed=True)
+    return re.sub(r'[^\w\-]', '_', filename)
+
+def allowed_file(filename):
+    """Проверяет, что расширение файла разрешено."""
+    return '.' in filename and \
+           filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
+
+def save_article_to_file(path, content):
+    """Сохраняет содержимое статьи в файл с обработкой ошибок."""
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    except Exception as e:
+        current_app.logger.error(f"Ошибка при сохранении файла: {e}")
+        raise
+
+def admin_required(f):
+    """Декоратор для проверки прав администратора."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated or not current_user.is_admin:
+            flash('Доступ запрещен', 'danger')
+            return redirect(url_for('web.index'))
+        return f(*args, **kwargs)
+    return decorated_function
@@ -0,0 +1,400 @@
+import os
+from datetime import datetime
+from flask import Blueprint, current_app, flash, jsonify, make_response, redirect, render_template, request, url_for
+from flask_login import current_user, login_required, login_user, logout_user
+from cleanup import delete_articles
+from convert import convert_md_to_html
+from extensions import db, limiter
+from models import DEFAULT_AVATAR, Article, ArticleLike, ArticleView, Comment, User
+from passwords import PasswordHasherBusy, hash_password, verify_password
+from trending import trending_articles
+from utils import ALLOWED_TAGS, allowed_file, sanitize_filename, save_article_to_file
+
+# Blueprint основного сайта
+web_bp = Blueprint('web', __name__)
+
+# Маршруты приложения
+@web_bp.route('/')
+def index():
+    """Главная страница со списком статей."""
+    sort_by = request.args.get('sort', 'newest')
+
+    # Фильтрация статей для неавторизованных пользователей
+    query = Article.query if current_user.is_authenticated else Article.query.filter_by(registered=False)
+
+    # Сортировка статей
+    if sort_by == 'views':
+        articles = query.order_by(Article.views.desc()).all()
+    elif sort_by == 'oldest':
+        articles = query.order_by(Article.created_at.asc()).all()
+    elif sort_by == 'likes':
+        articles = query.order_by(Article.likes_count.desc()).all()
+    elif sort_by == 'trending':
+        articles = trending_articles(query, include_registered=current_user.is_authenticated)
+    else:  # По умолчанию - новые сначала
+        articles = query.order_by(Article.created_at.desc()).all()
+
+    return render_template('index.html', articles=articles, current_sort=sort_by)
+
+@web_bp.route('/login', methods=['GET', 'POST'])
+@limiter.limit('login', 10, 60)
+def login():
+    """Страница входа в систему."""
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+        user = User.query.filter_by(username=username).first()
+
+        try:
+            if user and verify_password(user.password, password):
+                login_user(user)
+                return redirect(url_for('web.index'))
+        except PasswordHasherBusy:
+            flash('Сервер перегружен, попробуйте позже', 'error')
+            return render_template('login.html'), 503
+
+        flash('Неверный логин или пароль')
+    return render_template('login.html')
+
+@web_bp.route('/register', methods=['GET', 'POST'])
+@limiter.limit('register', 5, 600)
+def register():
+    """Страница регистрации."""
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+
+        if User.query.filter_by(username=username).first():
+            flash('Пользователь уже существует')
+            return redirect(url_for('web.register'))
+
+        try:
+            hashed_password = hash_password(password)
+        except PasswordHasherBusy:
+            flash('Сервер перегружен, попробуйте позже', 'error')
+            return render_template('register.html'), 503
+        new_user = User(username=username, password=hashed_password)
+        db.session.add(new_user)
+        db.session.commit()
+
+        flash('Успешная регистрация')
+        return redirect(url_for('web.login'))
+
+    return render_template('register.html')
+
+@web_bp.route('/logout')
+@login_required
+def logout():
+    """Выход из системы."""
+    logout_user()
+    return redirect(url_for('web.index'))
+
+@web_bp.route('/profile')
+@login_required
+def profile():
+    """Перенаправление на профиль текущего пользователя."""
+    return redirect(url_for('web.user_profile', username=current_user.username))
+
+@web_bp.route('/upload_avatar', methods=['POST'])
+@login_required
+def upload_avatar():
+    """Загрузка аватара пользователя."""
+    if 'avatar' not in request.files:
+        flash('Файл не выбран', 'error')
+        return redirect(url_for('web.profile'))
+
+    file = request.files['avatar']
+
+    if file.filename == '':
+        flash('Файл не выбран', 'error')
+        return redirect(url_for('web.profile'))
+
+    if not allowed_file(file.filename):
+        flash('Разрешены только файлы: png, jpg, jpeg, gif', 'error')
+        return redirect(url_for('web.profile'))
+
+    # Проверка размера файла
+    file.seek(0, os.SEEK_END)
+    file_length = file.tell()
+    file.seek(0)
+
+    if file_length > current_app.config['MAX_CONTENT_LENGTH']:
+        flash('Файл слишком большой (максимум 2MB)', 'error')
+        return redirect(url_for('web.profile'))
+
+    # Генерация имени файла
+    extension = file.filename.rsplit('.', 1)[1].lower()
+    filename = f"avatar_{current_user.id}.{extension}"
+    filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+
+    # Удаление старого аватара (если не дефолтный)
+    if current_user.avatar != DEFAULT_AVATAR:
+        old_filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], current_user.avatar)
+        if os.path.exists(old_filepath):
+            os.remove(old_filepath)
+
+    # Сохранение нового файла
+    try:
+        file.save(filepath)
+        current_user.avatar = filename
+        db.session.commit()
+        flash('Аватар успешно обновлен', 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash('Ошибка при сохранении аватара', 'error')
+        current_app.logger.error(f"Ошибка загрузки аватара: {str(e)}")
+
+    return redirect(url_for('web.profile'))
+
+@web_bp.route('/user/<username>')
+def user_profile(username):
+    """Страница профиля пользователя."""
+    user = User.query.filter_by(username=username).first_or_404()
+
+    # Получение статей пользователя
+    articles_query = Article.query.filter_by(author=username)
+    if not current_user.is_authenticated:
+        articles_query = articles_query.filter_by(registered=False)
+
+    articles = articles_query.all()
+    return render_template('profile.html',
+                         user=user,
+                         articles=articles,
+                         is_owner=current_user == user)
+
+@web_bp.route('/add_article', methods=['GET', 'POST'])
+@login_required
+def add_article():
+    """Добавление новой статьи."""
+    if request.method == 'POST':
+        name = request.form['name']
+        tag = request.form['tag']
+        text = request.form['text']
+        registered = 'registered' in request.form
+
+        if tag not in ALLOWED_TAGS:
+            flash('Недопустимый тег. Выберите из списка.')
+            return redirect(url_for('web.add_article'))
+
+        # Создание пути для сохранения статьи
+        time_str = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        sanitized_name = sanitize_filename(name)
+        path = f"articles/{time_str}_{sanitized_name}-{current_user.username}/main.md"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Сохранение статьи
+        save_article_to_file(path, text)
+        convert_md_to_html(path)
+
+        # Добавление статьи в базу данных
+        new_article = Article(
+            author=current_user.username,
+            name=name,
+            tag=tag,
+            registered=registered,
+            path=path
+        )
+        db.session.add(new_article)
+        db.session.commit()
+
+        flash('Статья успешно добавлена')
+        return redirect(url_for('web.index'))
+
+    return render_template('add_article.html', allowed_tags=ALLOWED_TAGS)
+
+@web_bp.route('/edit_article/<int:id>', methods=['GET', 'POST'])
+@login_required
+def edit_article(id):
+    """Редактирование существующей статьи."""
+    article = Article.query.get_or_404(id)
+
+    if article.author != current_user.username:
+        flash('Вы не автор этой статьи')
+        return redirect(url_for('web.index'))
+
+    if request.method == 'POST':
+        article.name = request.form['name']
+        article.tag = request.form['tag']
+        article.registered = 'registered' in request.form
+
+        if article.tag not in ALLOWED_TAGS:
+            flash('Неверный тег, пожалуйста выберите из разрешенных')
+            return redirect(url_for('web.edit_article', id=article.id))
+
+        # Обновление содержимого статьи
+        save_article_to_file(article.path, request.form['text'])
+        convert_md_to_html(article.path)
+        db.session.commit()
+
+        flash('Статья успешно обновленна')
+        return redirect(url_for('web.index'))
+
+    # Чтение текущего содержимого статьи
+    with open(article.path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    return render_template('edit_article.html',
+                         article=article,
+                         content=content,
+                         allowed_tags=ALLOWED_TAGS)
+
+@web_bp.route('/delete_article/<int:id>', methods=['POST'])
+@login_required
+def delete_article(id):
+    """Удаление статьи."""
+    article = Article.query.get_or_404(id)
+
+    if article.author != current_user.username:
+        flash('Вы должны быть автором чтобы удалить эту статью')
+        return redirect(url_for('web.index'))
+
+    # Удаление файлов статьи
+    try:
+        os.remove(article.path)
+        html_path = article.path.rstrip(".md") + ".html"
+        if os.path.exists(html_path):
+            os.remove(html_path)
+    except Exception as e:
+        current_app.logger.error(f"Ошибка удаления файлов статьи: {str(e)}")
+
+    # Удаление статьи и связанных с ней строк (комментарии, лайки, просмотры, рейтинг)
+    delete_articles([article.id])
+    db.session.commit()
+
+    flash('Статья успешно удаленна')
+    return redirect(url_for('web.index'))
+
+@web_bp.route('/article/<int:id>')
+def view_article(id):
+    """Просмотр статьи."""
+    article = Article.query.get_or_404(id)
+
+    # Проверка доступа к закрытым статьям
+    if article.registered and not current_user.is_authenticated:
+        flash('Для просмотра этой статьи войдите в систему')
+        return redirect(url_for('web.login'))
+
+    # Учет просмотров
+    if current_user.is_authenticated:
+        # Для авторизованных пользователей
+        view_exists = ArticleView.query.filter_by(
+            user_id=current_user.id,
+            article_id=article.id
+        ).first()
+    else:
+        # Для анонимных пользователей
+        cookie_name = f'article_view_{article.id}'
+        view_exists = request.cookies.get(cookie_name)
+
+    # Увеличение счетчика просмотров
+    if not view_exists:
+        article.views += 1
+
+        if current_user.is_authenticated:
+            db.session.add(ArticleView(
+                user_id=current_user.id,
+                article_id=article.id
+            ))
+
+        db.session.commit()
+
+    # Чтение содержимого статьи
+    html_path = article.path.rstrip(".md") + ".html"
+    try:
+        with open(html_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+    except Exception as e:
+        current_app.logger.error(f"Ошибка чтения файла статьи: {str(e)}")
+        content = "<p>Ошибка загрузки содержимого статьи</p>"
+
+    # Создание ответа с кукой для анонимных пользователей
+    response = make_response(render_template(
+        'view_article.html',
+        article=article,
+        content=content
+    ))
+
+    if not current_user.is_authenticated and not view_exists:
+        response.set_cookie(
+            f'article_view_{article.id}',
+            '1',
+            max_age=86400*7  # Кука на 7 дней
+        )
+
+    return response
+
+@web_bp.route('/tag/<string:tag>')
+def articles_by_tag(tag):
+    """Фильтрация статей по тегу."""
+    articles = Article.query.filter_by(tag=tag).all()
+    return render_template('index.html', articles=articles)
+
+# Комментарии
+@web_bp.route('/add_comment/<int:article_id>', methods=['POST'])
+@login_required
+@limiter.limit('comment', 10, 60)
+def add_comment(article_id):
+    """Добавление комментария к статье."""
+    text = request.form.get('text')
+
+    if not text:
+        flash('Комментарий не может быть пустым', 'error')
+        return redirect(url_for('web.view_article', id=article_id))
+
+    new_comment = Comment(
+        text=text,
+        user_id=current_user.id,
+        article_id=article_id
+    )
+    db.session.add(new_comment)
+    db.session.commit()
+
+    flash('Комментарий добавлен', 'success')
+    return redirect(url_for('web.view_article', id=article_id))
+
+@web_bp.route('/delete_comment/<int:comment_id>', methods=['POST'])
+@login_required
+def delete_comment(comment_id):
+    """Удаление комментария."""
+    comment = Comment.query.get_or_404(comment_id)
+
+    if current_user.id != comment.user_id and not current_user.is_admin:
+        flash('Вы не можете удалить этот комментарий', 'error')
+        return redirect(url_for('web.view_article', id=comment.article_id))
+
+    db.session.delete(comment)
+    db.session.commit()
+
+    flash('Комментарий удален', 'success')
+    return redirect(url_for('web.view_article', id=comment.article_id))
+
+# Лайки
+@web_bp.route('/like_article/<int:article_id>', methods=['POST'])
+@login_required
+@limiter.limit('like', 30, 60)
+def like_article(article_id):
+    """Обработка лайков/анлайков статей."""
+    article = Article.query.get_or_404(article_id)
+
+    like = ArticleLike.query.filter_by(
+        user_id=current_user.id,
+        article_id=article.id
+    ).first()
+
+    if like:
+        # Удаление лайка
+        db.session.delete(like)
+        article.likes_count -= 1
+        status = 'unliked'
+    else:
+        # Добавление лайка
+        new_like = ArticleLike(
+            user_id=current_user.id,
+            article_id=article.id
+        )
+        db.session.add(new_like)
+        article.likes_count += 1
+        status = 'liked'
+
+    db.session.commit()
+    return jsonify({'status': status, 'likes': article.likes_count})